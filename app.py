@@ -1,4 +1,7 @@
+import io
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 from dotenv import load_dotenv
 import streamlit as st
 from apify_client import ApifyClient
@@ -7,9 +10,10 @@ import numpy as np
 
 # Plotly is optional; avoid crashing if not installed
 try:
-    import plotly.express as px
+    import plotly.graph_objects as go
+    from plotly.colors import sequential
 except Exception:  # ModuleNotFoundError or other import issues
-    px = None
+    go = None
 
 # -----------------------------
 # Load .env and get API token
@@ -20,8 +24,59 @@ APIFY_TOKEN = os.getenv("APIFY_TOKEN")
 if not APIFY_TOKEN:
     raise ValueError("APIFY_TOKEN not found. Please set it in the .env file.")
 
-# Initialize Apify client
-client = ApifyClient(APIFY_TOKEN)
+# Initialize Apify client once per server process; cache_resource shares the
+# instance (and its HTTP connection pool) across reruns and sessions
+@st.cache_resource
+def get_apify_client() -> ApifyClient:
+    return ApifyClient(APIFY_TOKEN)
+
+
+# -----------------------------
+# Constants
+# -----------------------------
+# User-friendly labels for Apify productType values; anything else maps to "Other"
+PRODUCT_TYPE_MAP = {
+    "feed": "Feed Post (Photo/Video)",
+    "feed_single": "Feed Post (Photo/Video)",
+    "feed_video": "Feed Post (Photo/Video)",
+    "carousel_container": "Post (Multiple Images/Videos)",
+    "reels": "Reel (Short Video)",
+    "clips": "Reel (Short Video)",
+    "story": "Story (24h Post)",
+    "igtv": "IGTV (Long Video, Legacy)",
+    "live": "Live Video",
+    "ad": "Sponsored Post",
+    "sponsored": "Sponsored Post",
+    "shopping": "Shoppable Post",
+    "product_tag": "Shoppable Post",
+    "guide": "Guide (Curated Content)",
+    "carousel_child": "Carousel Slide (Part of Post)"
+}
+# Every label productType can end up with, in a stable order
+PRODUCT_TYPE_LABELS = tuple(dict.fromkeys([*PRODUCT_TYPE_MAP.values(), "Other"]))
+# Raw productType value -> code of its label in PRODUCT_TYPE_LABELS
+PRODUCT_TYPE_CODES = {raw: PRODUCT_TYPE_LABELS.index(label) for raw, label in PRODUCT_TYPE_MAP.items()}
+OTHER_PRODUCT_TYPE_CODE = PRODUCT_TYPE_LABELS.index("Other")
+
+# Columns kept (in display order) for each search path
+HASHTAG_COLUMNS = (
+    "caption", "ownerUsername", "likesCount", "commentsCount", "url", "productType",
+    "mentions", "taggedUsers", "hashtags"
+)
+OWNER_COLUMNS = (
+    "caption", "commentsCount", "firstComment", "hashtags", "lastComment",
+    "likesCount", "mentions", "ownerUsername", "productType", "timestamp",
+    "type", "url", "videoViewCount"
+)
+# List-valued columns shown as comma-joined text
+LIST_COLUMNS = ("hashtags", "mentions", "taggedUsers")
+# Every item field any search path reads
+ITEM_FIELDS = tuple(dict.fromkeys(HASHTAG_COLUMNS + OWNER_COLUMNS))
+# Free-text columns kept as Arrow-backed strings, so slicing and comparisons
+# run in Arrow compute kernels instead of over Python objects
+TEXT_COLUMNS = ("caption", "ownerUsername", "url", "firstComment", "lastComment", "type")
+# Numeric columns the reach/impressions aggregation reads
+PIE_METRIC_COLUMNS = ("likesCount", "commentsCount", "videoViewCount", "playsCount", "impressions", "reach")
 
 # -----------------------------
 # Streamlit app
@@ -30,276 +85,358 @@ st.set_page_config(page_title="Instagram Hashtag Analyzer", layout="wide")
 st.title("📸 Instagram Hashtag Analyzer")
 
 
+# Helper: Run an Apify actor and return at most max_posts of its dataset items
+def _run_actor(actor_id: str, run_input: dict, max_posts: int) -> list:
+    client = get_apify_client()
+    run = client.actor(actor_id).call(run_input=run_input)
+    # Stream pages with iterate_items and keep only the fields some view reads,
+    # so neither this list nor the cached copy holds the full nested payloads.
+    # The actor can return more than resultsLimit, so cap the read as well.
+    dataset = client.dataset(run["defaultDatasetId"])
+    return [
+        {field: item[field] for field in ITEM_FIELDS if field in item}
+        for item in dataset.iterate_items(limit=max_posts)
+    ]
+
+
+# Cached fetches: reruns with the same query reuse the previous actor results
+# instead of paying for another actor run (tens of seconds to minutes).
+@st.cache_data(show_spinner=False, ttl=3600)
+def fetch_hashtag_posts(hashtag: str, max_posts: int) -> list:
+    return _run_actor("apify/instagram-hashtag-scraper", {
+        "hashtags": [hashtag],
+        "resultsLimit": max_posts
+    }, max_posts)
+
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def fetch_owner_posts(owner_username: str, max_posts: int) -> list:
+    return _run_actor("apify/instagram-post-scraper", {
+        "username": [owner_username],
+        "resultsLimit": max_posts
+    }, max_posts)
+
+
+# Helper: Build the posts frame from actor items with Arrow-backed text columns.
+# Only the requested columns (in that order) are materialized; the actor returns
+# dozens of nested fields (childPosts, images, ...) that the app never reads.
+# Columns absent from every item are skipped.
+def posts_frame(items: list, columns: tuple) -> pd.DataFrame:
+    present = set().union(*items)
+    df = pd.DataFrame({col: [item.get(col) for item in items] for col in columns if col in present})
+    for col in TEXT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("string[pyarrow]")
+    return df
+
+
+# Helper: Keep only items whose ownerUsername matches owner_username (case-insensitive).
+# Filtering the raw items means rejected posts never reach the DataFrame, and
+# the target is case-folded once. Items without a username never match.
+def filter_by_owner(items: list, owner_username: str) -> list:
+    target = owner_username.strip().casefold()
+    return [
+        item for item in items
+        if isinstance(item.get("ownerUsername"), str) and item["ownerUsername"].casefold() == target
+    ]
+
+
+# Helper: Text for one entry of a list column; tagged users arrive as dicts
+def _list_entry_text(entry) -> str:
+    if isinstance(entry, dict):
+        return str(entry.get("username", entry))
+    return str(entry)
+
+
+# Helper: Turn actor items into the display frame: project the kept columns,
+# apply the optional ownerUsername filter, truncate captions to 125 characters,
+# flatten list columns and map productType values to user-friendly labels.
+# Cached on (items, columns, owner_filter), so re-submitting a search that hits
+# the fetch cache skips the whole transform.
+@st.cache_data(show_spinner=False, ttl=3600)
+def prepare_posts(items: list, columns: tuple, owner_filter: str = "") -> pd.DataFrame:
+    if owner_filter:
+        items = filter_by_owner(items, owner_filter)
+    filtered_df = posts_frame(items, columns)
+    if "caption" in filtered_df.columns:
+        filtered_df["caption"] = filtered_df["caption"].str.slice(0, 125)
+    # Join list columns into text once here, rather than having st.dataframe and
+    # the exports stringify every list cell on each render
+    for col in LIST_COLUMNS:
+        if col in filtered_df.columns:
+            filtered_df[col] = pd.array(
+                [", ".join(map(_list_entry_text, v)) if isinstance(v, list) else None
+                 for v in filtered_df[col]],
+                dtype="string[pyarrow]",
+            )
+    if "productType" in filtered_df.columns:
+        # Factorize, look up a label code once per distinct raw value, then
+        # gather codes for every row in one NumPy take. Missing values factorize
+        # to -1, which picks the trailing "Other" entry of the lookup.
+        codes, uniques = pd.factorize(filtered_df["productType"])
+        lookup = np.array(
+            [PRODUCT_TYPE_CODES.get(raw, OTHER_PRODUCT_TYPE_CODE) for raw in uniques]
+            + [OTHER_PRODUCT_TYPE_CODE]
+        )
+        # Stored as a Categorical: one small int code per row instead of a
+        # repeated Python string
+        filtered_df["productType"] = pd.Categorical.from_codes(lookup[codes], categories=PRODUCT_TYPE_LABELS)
+    return filtered_df
+
+
+# Helper: Serialize a frame to CSV bytes. Cached so downloading the same results
+# again reuses the encoded bytes.
+@st.cache_data(show_spinner=False, ttl=3600)
+def df_to_csv(df: pd.DataFrame) -> bytes:
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False)
+    return buf.getvalue()
+
+
+# Helper: Serialize a frame to Parquet bytes. Arrow writes it in C++ and the
+# file is far smaller than the CSV for large result sets.
+@st.cache_data(show_spinner=False, ttl=3600)
+def df_to_parquet(df: pd.DataFrame) -> bytes:
+    buf = io.BytesIO()
+    df.to_parquet(buf, engine="pyarrow", compression="snappy", index=False)
+    return buf.getvalue()
+
+
+# Helper: Metric column as a float array with missing values as 0. Counts from
+# Apify usually arrive as int/float already, so only coerce other dtypes.
+def _metric_array(series: pd.Series) -> np.ndarray:
+    if not pd.api.types.is_numeric_dtype(series):
+        series = pd.to_numeric(series, errors="coerce")
+    return series.fillna(0).to_numpy(dtype=float)
+
+
+# Helper: Sum estimated reach and impressions per content type. Cached so a
+# rerun over the same posts skips the numeric coercion and the aggregation.
+@st.cache_data(show_spinner=False, ttl=3600)
+def _reach_impressions_by_type(df_in: pd.DataFrame, type_col: str) -> pd.DataFrame:
+    # Each metric as a float array; zeros when the column is missing
+    zeros = np.zeros(len(df_in))
+    likes, comments, video_views, plays, impressions, reach = (
+        _metric_array(df_in[col]) if col in df_in.columns else zeros
+        for col in PIE_METRIC_COLUMNS
+    )
+    # Prefer provided impressions/reach; fallback to interactions + views, only
+    # computed for the posts that lack both (none when Apify returns reach)
+    impressions_max = np.maximum(impressions, reach)
+    reach_estimate = impressions_max.copy()
+    fallback = impressions_max == 0
+    if fallback.any():
+        views = np.maximum(video_views[fallback], plays[fallback])
+        reach_estimate[fallback] = likes[fallback] + comments[fallback] + views
+    # Sum per content type with weighted bincounts over the factorized codes.
+    # There are only a handful of types, so this skips groupby's fixed overhead.
+    # Codes follow sorted (category) order like groupby; missing types (-1) are
+    # dropped as groupby would.
+    codes, types = pd.factorize(df_in[type_col], sort=True)
+    valid = codes >= 0
+    reach_sum = np.bincount(codes[valid], weights=reach_estimate[valid], minlength=len(types))
+    impressions_sum = np.bincount(codes[valid], weights=impressions_max[valid], minlength=len(types))
+    return pd.DataFrame({
+        type_col: np.asarray(types),
+        "Reach": np.where(reach_sum != 0, reach_sum, np.nan),
+        "Impressions": np.where(impressions_sum != 0, impressions_sum, np.nan),
+    })
+
+
+# Helper: Donut chart built straight from a go.Pie trace, skipping px.pie's
+# long-form frame. Colors cycle through the palette like px's color sequence.
+def _donut(labels: pd.Series, values: pd.Series, palette: list) -> "go.Figure":
+    colors = [palette[i % len(palette)] for i in range(len(labels))]
+    return go.Figure(go.Pie(
+        labels=labels.tolist(), values=values.tolist(), hole=0.5, marker_colors=colors,
+        textposition="inside", texttemplate="%{label}<br>%{percent:.1%}",
+    ))
+
+
 # Helper: Render Reach & Impressions pie charts by content type
 def render_reach_impressions_pies(df_in: pd.DataFrame, type_col: str = "productType") -> None:
     if df_in is None or df_in.empty:
         return
-    if px is None:
+    if go is None:
         st.info(
             "Plotly is not installed, so pie charts are disabled. "
             "Install it with `pip install plotly` or add `plotly` to requirements.txt and redeploy."
         )
         return
-    work = df_in.copy()
-    # Ensure numeric columns exist and are numeric
-    for col in ["likesCount", "commentsCount", "videoViewCount", "playsCount", "impressions", "reach"]:
-        if col in work.columns:
-            work[col] = pd.to_numeric(work[col], errors="coerce").fillna(0)
-        else:
-            work[col] = 0
-    work["views_count"] = work[["videoViewCount", "playsCount"]].max(axis=1)
-    # Prefer provided impressions/reach; fallback to interactions + views
-    work["impressions_proxy"] = work[["impressions", "reach"]].max(axis=1)
-    work["impressions_proxy"] = work["impressions_proxy"].replace(0, np.nan)
-    fallback = work["likesCount"] + work["commentsCount"] + work["views_count"]
-    work["reach_estimate"] = work["impressions_proxy"].fillna(fallback)
-    if type_col not in work.columns:
+    if type_col not in df_in.columns:
         return
-    grouped = work.groupby(type_col).agg(
-        Reach=("reach_estimate", "sum"),
-        Impressions=("impressions_proxy", "sum"),
-    ).reset_index()
-    grouped["Reach"] = pd.to_numeric(grouped["Reach"], errors="coerce").replace(0, np.nan)
-    grouped["Impressions"] = pd.to_numeric(grouped["Impressions"], errors="coerce").replace(0, np.nan)
-    if grouped[["Reach", "Impressions"]].fillna(0).sum().sum() == 0:
+    # Only hand the columns the aggregation reads to the cache, so hashing
+    # stays cheap.
+    used_cols = [type_col] + [col for col in PIE_METRIC_COLUMNS if col in df_in.columns]
+    grouped = _reach_impressions_by_type(df_in[used_cols], type_col)
+    # Zero sums are already NaN in grouped, and .sum() skips NaN
+    has_reach = grouped["Reach"].sum() > 0
+    has_imp = grouped["Impressions"].sum() > 0
+    if not has_reach and not has_imp:
         st.info("No reach or impressions data available to visualize.")
         return
+    types = grouped[type_col]
     col_a, col_b = st.columns(2)
     with col_a:
-        reach_df = grouped[[type_col, "Reach"]].dropna(subset=["Reach"]) if "Reach" in grouped.columns else pd.DataFrame()
-        if not reach_df.empty and reach_df["Reach"].sum() > 0:
-            fig = px.pie(reach_df, names=type_col, values="Reach", hole=0.5,
-                         color_discrete_sequence=px.colors.sequential.Purples)
-            fig.update_traces(textposition="inside", texttemplate="%{label}<br>%{percent:.1%}")
+        if has_reach:
+            shown = grouped["Reach"].notna()
+            fig = _donut(types[shown], grouped["Reach"][shown], sequential.Purples)
             st.plotly_chart(fig, use_container_width=True)
             st.caption("Share of Estimated Reach by content type.")
     with col_b:
-        imp_df = grouped[[type_col, "Impressions"]].dropna(subset=["Impressions"]) if "Impressions" in grouped.columns else pd.DataFrame()
-        if not imp_df.empty and imp_df["Impressions"].sum() > 0:
-            fig2 = px.pie(imp_df, names=type_col, values="Impressions", hole=0.5,
-                          color_discrete_sequence=px.colors.sequential.Magma)
-            fig2.update_traces(textposition="inside", texttemplate="%{label}<br>%{percent:.1%}")
+        if has_imp:
+            shown = grouped["Impressions"].notna()
+            fig2 = _donut(types[shown], grouped["Impressions"][shown], sequential.Magma)
             st.plotly_chart(fig2, use_container_width=True)
             st.caption("Share of Impressions (proxy) by content type.")
 
 
+# Helper: Render the charts, table and downloads for a finished search.
+# Results live in st.session_state, so reruns triggered by other widgets
+# (including the download button itself) redraw them without re-fetching.
+def render_search_results(query: str, filtered_df: pd.DataFrame, key: str) -> None:
+    if "likesCount" in filtered_df.columns and "commentsCount" in filtered_df.columns:
+        st.subheader("📊 Posts Engagement Summary")
+        # Top 20 posts by likes; nlargest is a partial sort, not a full one.
+        # Coerce first: an all-null column arrives as object dtype.
+        likes = pd.to_numeric(filtered_df["likesCount"], errors="coerce")
+        top = likes.nlargest(20).index
+        top_posts = pd.DataFrame({
+            "likesCount": likes[top],
+            "commentsCount": pd.to_numeric(filtered_df.loc[top, "commentsCount"], errors="coerce"),
+        })
+        st.bar_chart(top_posts.reset_index(drop=True))
+    st.subheader("🍰 Reach & Impressions Breakdown")
+    render_reach_impressions_pies(filtered_df)
+    st.subheader("📋 Filtered Posts Data")
+    st.dataframe(filtered_df)
+    # Pass callables so the files are only built when a button is clicked
+    st.download_button("Download CSV", data=partial(df_to_csv, filtered_df),
+                       file_name=f"{query}_posts.csv", mime="text/csv", key=key)
+    st.download_button("Download Parquet", data=partial(df_to_parquet, filtered_df),
+                       file_name=f"{query}_posts.parquet", mime="application/vnd.apache.parquet",
+                       key=f"{key}_parquet")
+
+
 # Tabs for search mode
-tab1, tab2 = st.tabs(["Search by Hashtag", "Search by Owner Username"])
+tab1, tab2, tab3 = st.tabs(["Search by Hashtag", "Search by Owner Username", "Search Both"])
+
+# Inputs sit in st.form blocks so typing or dragging a slider doesn't rerun the
+# script; only the submit button does.
+
+# The combined search is handled first so the hashtag and owner tabs, drawn
+# below, already show its results in this same run.
+with tab3:
+    with st.form("both_form"):
+        both_hashtag = st.text_input("Enter Instagram Hashtag (without #):", key="both_hashtag")
+        both_owner = st.text_input("Enter Instagram Owner Username:", key="both_owner")
+        max_posts_both = st.slider("Number of posts to fetch (each)", min_value=10, max_value=100, value=50, step=10, key="both_slider")
+        both_submitted = st.form_submit_button("Search Both")
+    if both_submitted:
+        if both_hashtag and both_owner:
+            try:
+                # The actor calls are I/O-bound and apify_client is synchronous, so
+                # two threads bring the wait down to the slower of the two runs.
+                # Each run is reported in the status box as soon as it finishes.
+                with st.status(
+                    f"Fetching posts for #{both_hashtag} and @{both_owner}... This may take a few seconds."
+                ) as status, ThreadPoolExecutor(max_workers=2) as executor:
+                    hashtag_future = executor.submit(fetch_hashtag_posts, both_hashtag, max_posts_both)
+                    owner_future = executor.submit(fetch_owner_posts, both_owner, max_posts_both)
+                    labels = {hashtag_future: f"#{both_hashtag}", owner_future: f"@{both_owner}"}
+                    for future in as_completed(labels):
+                        status.write(f"Fetched {len(future.result())} posts for {labels[future]}.")
+                    status.update(label="Fetch complete.", state="complete")
+                hashtag_items, owner_items = hashtag_future.result(), owner_future.result()
+                if not hashtag_items and not owner_items:
+                    st.warning("No posts found.")
+                else:
+                    st.success(
+                        f"Found {len(hashtag_items)} posts for #{both_hashtag} and {len(owner_items)} posts "
+                        f"for @{both_owner}! See the hashtag and owner tabs."
+                    )
+                for state_key, query, label, items, columns in (
+                    ("hashtag_results", both_hashtag, f"#{both_hashtag}", hashtag_items, HASHTAG_COLUMNS),
+                    ("owner_results", both_owner, f"@{both_owner}", owner_items, OWNER_COLUMNS),
+                ):
+                    filtered_df = prepare_posts(items, columns) if items else None
+                    # Items without any kept column (e.g. actor error items) leave an empty frame
+                    if filtered_df is not None and filtered_df.empty:
+                        st.warning(f"No usable posts returned for {label}.")
+                        filtered_df = None
+                    if filtered_df is None:
+                        st.session_state.pop(state_key, None)
+                    else:
+                        st.session_state[state_key] = (query, filtered_df)
+            except Exception as e:
+                st.error(f"Error fetching data: {e}")
+                # Don't leave an earlier query's results under the error
+                st.session_state.pop("hashtag_results", None)
+                st.session_state.pop("owner_results", None)
+        else:
+            st.warning("Please enter both a hashtag and an owner username!")
 
 with tab1:
-    hashtag = st.text_input("Enter Instagram Hashtag (without #):")
-    max_posts = st.slider("Number of posts to fetch", min_value=10, max_value=100, value=50, step=10, key="hashtag_slider")
-    owner_username_filter = st.text_input("Lock on ownerUsername (optional):", key="hashtag_owner_filter")
-    if st.button("Search by Hashtag"):
+    with st.form("hashtag_form"):
+        hashtag = st.text_input("Enter Instagram Hashtag (without #):")
+        max_posts = st.slider("Number of posts to fetch", min_value=10, max_value=100, value=50, step=10, key="hashtag_slider")
+        owner_username_filter = st.text_input("Lock on ownerUsername (optional):", key="hashtag_owner_filter")
+        hashtag_submitted = st.form_submit_button("Search by Hashtag")
+    if hashtag_submitted:
         if hashtag:
             st.info(f"Fetching posts for #{hashtag}... This may take a few seconds.")
             try:
-                actor_id = "apify/instagram-hashtag-scraper"
-                run_input = {
-                    "hashtags": [hashtag],
-                    "resultsLimit": max_posts
-                }
-                client = ApifyClient(APIFY_TOKEN)
-                run = client.actor(actor_id).call(run_input=run_input)
-                dataset_id = run["defaultDatasetId"]
-                dataset = client.dataset(dataset_id)
-                items = list(dataset.list_items().items)
+                items = fetch_hashtag_posts(hashtag, max_posts)
                 if not items:
                     st.warning("No posts found.")
+                    st.session_state.pop("hashtag_results", None)
                 else:
                     st.success(f"Found {len(items)} posts!")
-                    df = pd.DataFrame(items)
-                    # Filter by ownerUsername if specified
-                    if owner_username_filter:
-                        if "ownerUsername" in df.columns:
-                            df = df[df["ownerUsername"].astype(str).str.lower() == owner_username_filter.strip().lower()]
-                    # ...existing code for filtering columns, mapping productType, truncating caption, displaying and exporting...
-                    columns_to_keep = [
-                        "caption", "ownerUsername", "likesCount", "commentsCount", "url", "productType",
-                        "mentions", "taggedUsers", "hashtags"
-                    ]
-                    filtered_df = df[[col for col in columns_to_keep if col in df.columns]].copy()
-                    if "caption" in filtered_df.columns:
-                        filtered_df["caption"] = filtered_df["caption"].astype(str).str.slice(0, 125)
-                    product_type_map = {
-                        "feed": "Feed Post (Photo/Video)",
-                        "feed_single": "Feed Post (Photo/Video)",
-                        "feed_video": "Feed Post (Photo/Video)",
-                        "carousel_container": "Post (Multiple Images/Videos)",
-                        "reels": "Reel (Short Video)",
-                        "clips": "Reel (Short Video)",
-                        "story": "Story (24h Post)",
-                        "igtv": "IGTV (Long Video, Legacy)",
-                        "live": "Live Video",
-                        "ad": "Sponsored Post",
-                        "sponsored": "Sponsored Post",
-                        "shopping": "Shoppable Post",
-                        "product_tag": "Shoppable Post",
-                        "guide": "Guide (Curated Content)",
-                        "carousel_child": "Carousel Slide (Part of Post)"
-                    }
-                    if "productType" in filtered_df.columns:
-                        filtered_df["productType"] = filtered_df["productType"].map(
-                            lambda x: product_type_map.get(str(x), "Other")
-                        )
-                    st.subheader("🍰 Reach & Impressions Breakdown")
-                    render_reach_impressions_pies(filtered_df)
-                    st.subheader("📋 Filtered Posts Data")
-                    st.dataframe(filtered_df)
-                    csv = filtered_df.to_csv(index=False)
-                    st.download_button("Download CSV", data=csv, file_name=f"{hashtag}_posts.csv")
+                    filtered_df = prepare_posts(items, HASHTAG_COLUMNS, owner_username_filter)
+                    # Nothing to chart or export if the ownerUsername filter dropped every post,
+                    # or if no item carried any of the kept columns (e.g. actor error items)
+                    if filtered_df.empty:
+                        if owner_username_filter:
+                            st.warning("No posts matched the ownerUsername filter.")
+                        else:
+                            st.warning("No usable posts returned.")
+                        st.session_state.pop("hashtag_results", None)
+                    else:
+                        st.session_state["hashtag_results"] = (hashtag, filtered_df)
             except Exception as e:
                 st.error(f"Error fetching data: {e}")
+                st.session_state.pop("hashtag_results", None)
         else:
             st.warning("Please enter a hashtag!")
+    if "hashtag_results" in st.session_state:
+        render_search_results(*st.session_state["hashtag_results"], key="hashtag_download")
 
 with tab2:
-    owner_username = st.text_input("Enter Instagram Owner Username:")
-    max_posts_owner = st.slider("Number of posts to fetch", min_value=10, max_value=100, value=50, step=10, key="owner_slider")
-    if st.button("Search by Owner Username"):
+    with st.form("owner_form"):
+        owner_username = st.text_input("Enter Instagram Owner Username:")
+        max_posts_owner = st.slider("Number of posts to fetch", min_value=10, max_value=100, value=50, step=10, key="owner_slider")
+        owner_submitted = st.form_submit_button("Search by Owner Username")
+    if owner_submitted:
         if owner_username:
             st.info(f"Fetching posts for @{owner_username}... This may take a few seconds.")
             try:
-                actor_id = "apify/instagram-post-scraper"
-                run_input = {
-                    "username": [owner_username],
-                    "resultsLimit": max_posts_owner
-                }
-                client = ApifyClient(APIFY_TOKEN)
-                run = client.actor(actor_id).call(run_input=run_input)
-                dataset_id = run["defaultDatasetId"]
-                dataset = client.dataset(dataset_id)
-                items = list(dataset.list_items().items)
+                items = fetch_owner_posts(owner_username, max_posts_owner)
                 if not items:
                     st.warning("No posts found.")
+                    st.session_state.pop("owner_results", None)
                 else:
                     st.success(f"Found {len(items)} posts!")
-                    df = pd.DataFrame(items)
-                    columns_to_keep = [
-                        "caption", "commentsCount", "firstComment", "hashtags", "lastComment",
-                        "likesCount", "mentions", "ownerUsername", "productType", "timestamp",
-                        "type", "url", "videoViewCount"
-                    ]
-                    filtered_df = df[[col for col in columns_to_keep if col in df.columns]].copy()
-                    if "caption" in filtered_df.columns:
-                        filtered_df["caption"] = filtered_df["caption"].astype(str).str.slice(0, 125)
-                    product_type_map = {
-                        "feed": "Feed Post (Photo/Video)",
-                        "feed_single": "Feed Post (Photo/Video)",
-                        "feed_video": "Feed Post (Photo/Video)",
-                        "carousel_container": "Post (Multiple Images/Videos)",
-                        "reels": "Reel (Short Video)",
-                        "clips": "Reel (Short Video)",
-                        "story": "Story (24h Post)",
-                        "igtv": "IGTV (Long Video, Legacy)",
-                        "live": "Live Video",
-                        "ad": "Sponsored Post",
-                        "sponsored": "Sponsored Post",
-                        "shopping": "Shoppable Post",
-                        "product_tag": "Shoppable Post",
-                        "guide": "Guide (Curated Content)",
-                        "carousel_child": "Carousel Slide (Part of Post)"
-                    }
-                    if "productType" in filtered_df.columns:
-                        filtered_df["productType"] = filtered_df["productType"].map(
-                            lambda x: product_type_map.get(str(x), "Other")
-                        )
-                    st.subheader("🍰 Reach & Impressions Breakdown")
-                    render_reach_impressions_pies(filtered_df)
-                    st.subheader("📋 Filtered Posts Data")
-                    st.dataframe(filtered_df)
-                    csv = filtered_df.to_csv(index=False)
-                    st.download_button("Download CSV", data=csv, file_name=f"{owner_username}_posts.csv")
+                    filtered_df = prepare_posts(items, OWNER_COLUMNS)
+                    # Items without any kept column (e.g. actor error items) leave an empty frame
+                    if filtered_df.empty:
+                        st.warning("No usable posts returned.")
+                        st.session_state.pop("owner_results", None)
+                    else:
+                        st.session_state["owner_results"] = (owner_username, filtered_df)
             except Exception as e:
                 st.error(f"Error fetching data: {e}")
+                st.session_state.pop("owner_results", None)
         else:
             st.warning("Please enter an owner username!")
-
-
-if st.button("Search"):
-    if hashtag:
-        st.info(f"Fetching posts for #{hashtag}... This may take a few seconds.")
-
-        try:
-            actor_id = "apify/instagram-hashtag-scraper"
-
-            run_input = {
-                "hashtags": [hashtag],
-                "resultsLimit": max_posts
-            }
-
-            run = client.actor(actor_id).call(run_input=run_input)
-
-            dataset_id = run["defaultDatasetId"]
-            dataset = client.dataset(dataset_id)
-            items = list(dataset.list_items().items)
-
-            if not items:
-                st.warning("No posts found.")
-            else:
-                st.success(f"Found {len(items)} posts!")
-                df = pd.DataFrame(items)
-
-                # Filter by ownerUsername if specified
-                if owner_username_filter:
-                    if "ownerUsername" in df.columns:
-                        df = df[df["ownerUsername"].astype(str).str.lower() == owner_username_filter.strip().lower()]
-
-                # Only keep and reorder specified columns
-                columns_to_keep = [
-                    "ownerUsername", "caption", "likesCount", "commentsCount", "url",  "timestamp", "productType",
-                    "mentions", "firstComment", "latestComments", "hashtags"
-                ]
-                filtered_df = df[[col for col in columns_to_keep if col in df.columns]].copy()
-
-                # Truncate caption to 125 characters
-                if "caption" in filtered_df.columns:
-                    filtered_df["caption"] = filtered_df["caption"].astype(str).str.slice(0, 125)
-
-                # Map productType values to user-friendly labels
-                product_type_map = {
-                    "feed": "Feed Post (Photo/Video)",
-                    "feed_single": "Feed Post (Photo/Video)",
-                    "feed_video": "Feed Post (Photo/Video)",
-                    "carousel_container": "Post (Multiple Images/Videos)",
-                    "reels": "Reel (Short Video)",
-                    "clips": "Reel (Short Video)",
-                    "story": "Story (24h Post)",
-                    "igtv": "IGTV (Long Video, Legacy)",
-                    "live": "Live Video",
-                    "ad": "Sponsored Post",
-                    "sponsored": "Sponsored Post",
-                    "shopping": "Shoppable Post",
-                    "product_tag": "Shoppable Post",
-                    "guide": "Guide (Curated Content)",
-                    "carousel_child": "Carousel Slide (Part of Post)"
-                }
-                if "productType" in filtered_df.columns:
-                    filtered_df["productType"] = filtered_df["productType"].map(
-                        lambda x: product_type_map.get(str(x), "Other")
-                    )
-
-                # -----------------------------
-                # Show summary charts
-                # -----------------------------
-                st.subheader("📊 Posts Engagement Summary")
-                if "likesCount" in filtered_df.columns and "commentsCount" in filtered_df.columns:
-                    st.bar_chart(filtered_df[["likesCount", "commentsCount"]].head(20))
-
-                st.subheader("🍰 Reach & Impressions Breakdown")
-                render_reach_impressions_pies(filtered_df)
-
-                # -----------------------------
-                # Display full dataframe (only selected columns)
-                # -----------------------------
-                st.subheader("📋 Filtered Posts Data")
-                st.dataframe(filtered_df)
-
-                # CSV download (only selected columns)
-                csv = filtered_df.to_csv(index=False)
-                st.download_button("Download CSV", data=csv, file_name=f"{hashtag}_posts.csv")
-
-        except Exception as e:
-            st.error(f"Error fetching data: {e}")
-    else:
-        st.warning("Please enter a hashtag!")
+    if "owner_results" in st.session_state:
+        render_search_results(*st.session_state["owner_results"], key="owner_download")